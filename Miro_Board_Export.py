@@ -4,6 +4,9 @@ import os
 import csv
 import datetime
 import logging
+import shutil
+import statistics
+import tempfile
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Set, Any
 
@@ -26,7 +29,12 @@ class MiroConfig:
     profile_dir: str = "Default"
     link_file: str = "miro_board_links.json"
     report_file: str = "miro_export_report.csv"
+    session_file: str = "miro_session.json"
+    use_session_file: bool = True # Start from a minimal temp profile + saved session when available
     headless: bool = False
+    schedule_policy: str = "shortest_first" # "link_order", "shortest_first", "owner_grouped" or "deadline"
+    deadline_minutes: Optional[float] = None # Time budget for the "deadline" policy
+    default_board_seconds: float = 60.0 # Cost estimate when no history is available
     log_level: int = logging.INFO
 
 # ==================== Logging Setup ====================
@@ -50,7 +58,7 @@ logger = setup_logger()
 class CsvReport:
     """Handles CSV report operations: Initialization, Reading, and Upserting."""
 
-    HEADER = ["Timestamp", "Board Name", "URL", "Owner", "Status", "Error Message"]
+    HEADER = ["Timestamp", "Board Name", "URL", "Owner", "Status", "Error Message", "Duration (s)"]
 
     def __init__(self, filepath: str):
         self.filepath = filepath
@@ -73,7 +81,7 @@ class CsvReport:
             logger.error(f"Failed to create report file: {e}")
 
     def _normalize_header(self):
-        """Check and migrate old CSV formats to the new 6-column format."""
+        """Check and migrate old CSV formats to the new 7-column format."""
         try:
             rows_to_keep = []
             needs_rewrite = False
@@ -92,14 +100,16 @@ class CsvReport:
                 for row in reader:
                     if not row: continue
                     
-                    # Normalize to 6 columns
+                    # Normalize to 7 columns
                     new_row = []
                     if len(row) == 4: # Old format (Timestamp, Name, URL, Status)
-                        new_row = [row[0], "Unknown", row[1], "Unknown", row[2], row[3]]
+                        new_row = [row[0], "Unknown", row[1], "Unknown", row[2], row[3], ""]
                     elif len(row) == 5: # Previous format (Timestamp, Name, URL, Status, Error)
-                        new_row = [row[0], row[1], row[2], "Unknown", row[3], row[4]]
-                    elif len(row) >= 6:
-                        new_row = row[:6]
+                        new_row = [row[0], row[1], row[2], "Unknown", row[3], row[4], ""]
+                    elif len(row) == 6: # Previous format (no Duration)
+                        new_row = row + [""]
+                    elif len(row) >= 7:
+                        new_row = row[:7]
                     else:
                         continue # Skip invalid
                     
@@ -139,7 +149,32 @@ class CsvReport:
             pass
         return successful
 
-    def upsert_result(self, result: Dict[str, str]):
+    def get_history(self) -> Dict[str, Dict[str, Any]]:
+        """Return previous export outcomes keyed by URL, including duration if recorded."""
+        history = {}
+        if not os.path.exists(self.filepath):
+            return history
+
+        try:
+            with open(self.filepath, 'r', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                next(reader, None) # Skip header
+                for row in reader:
+                    # 0:Time, 1:Name, 2:URL, 3:Owner, 4:Status, 5:Error, 6:Duration
+                    if len(row) < 6:
+                        continue
+                    duration = None
+                    if len(row) >= 7 and row[6]:
+                        try:
+                            duration = float(row[6])
+                        except ValueError:
+                            pass
+                    history[row[2]] = {"owner": row[3], "status": row[4], "error": row[5], "duration": duration}
+        except Exception:
+            pass
+        return history
+
+    def upsert_result(self, result: Dict[str, Any]):
         """Update existing row or append new row based on URL."""
         try:
             rows = []
@@ -154,8 +189,10 @@ class CsvReport:
 
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             updated = False
-            # 0:Time, 1:Name, 2:URL, 3:Owner, 4:Status, 5:Error
-            new_entry = [timestamp, result["name"], result["url"], result.get("owner", "Unknown"), result["status"], result["error"]]
+            duration = result.get("duration")
+            duration_str = f"{duration:.1f}" if duration is not None else ""
+            # 0:Time, 1:Name, 2:URL, 3:Owner, 4:Status, 5:Error, 6:Duration
+            new_entry = [timestamp, result["name"], result["url"], result.get("owner", "Unknown"), result["status"], result["error"], duration_str]
 
             for i, row in enumerate(rows):
                 if len(row) >= 3 and row[2] == result["url"]:
@@ -173,23 +210,219 @@ class CsvReport:
         except Exception as e:
             logger.error(f"Failed to write CSV: {e}")
 
+# ==================== Export Scheduling ====================
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as a short 'XhYYm' / 'XmYYs' string."""
+    seconds = int(max(seconds, 0))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{secs:02d}s"
+
+class ExportScheduler:
+    """Estimates per-board export cost from report history and orders the export queue.
+
+    Estimates use, in order: the board's own recorded duration, the median
+    duration of the same owner's boards, the median of all boards, and
+    finally the configured default.
+    """
+
+    POLICIES = ("link_order", "shortest_first", "owner_grouped", "deadline")
+
+    def __init__(self, history: Dict[str, Dict[str, Any]], default_seconds: float = 60.0):
+        self.history = history
+        self.default_seconds = default_seconds
+        self.estimated_done = 0.0
+        self.actual_done = 0.0
+
+        owner_durations: Dict[str, List[float]] = {}
+        all_durations = []
+        for entry in history.values():
+            if entry.get("duration") is None or entry.get("status") != "Success":
+                continue
+            all_durations.append(entry["duration"])
+            owner = entry.get("owner", "Unknown")
+            if owner != "Unknown":
+                owner_durations.setdefault(owner, []).append(entry["duration"])
+
+        self.owner_medians = {owner: statistics.median(d) for owner, d in owner_durations.items()}
+        self.global_median = statistics.median(all_durations) if all_durations else default_seconds
+
+    def estimate(self, board: Dict[str, str]) -> float:
+        """Estimated export time in seconds for a board."""
+        entry = self.history.get(board["url"])
+        if entry and entry.get("duration") is not None:
+            return entry["duration"]
+        return self.owner_medians.get(board.get("owner", "Unknown"), self.global_median)
+
+    def order(self, boards: List[Dict[str, str]], policy: str,
+              deadline_minutes: Optional[float] = None) -> List[Dict[str, str]]:
+        """Return boards in export order for the given policy."""
+        if policy not in self.POLICIES:
+            logger.warning(f"Unknown schedule policy '{policy}', using link order.")
+            policy = "link_order"
+
+        if policy == "link_order":
+            return list(boards)
+
+        # sorted() is stable, so ties keep their link order
+        by_cost = sorted(boards, key=self.estimate)
+
+        if policy == "owner_grouped":
+            groups: Dict[str, List[Dict[str, str]]] = {}
+            for board in by_cost:
+                groups.setdefault(board.get("owner", "Unknown"), []).append(board)
+            # Cheapest owner groups first, each group shortest-first
+            ordered_groups = sorted(groups.values(), key=lambda g: sum(self.estimate(b) for b in g))
+            return [board for group in ordered_groups for board in group]
+
+        if policy == "deadline":
+            if deadline_minutes is None:
+                logger.warning("Deadline policy without deadline_minutes, using shortest-first.")
+                return by_cost
+            budget = deadline_minutes * 60
+            selected = []
+            total = 0.0
+            for board in by_cost:
+                cost = self.estimate(board)
+                if total + cost > budget:
+                    break
+                selected.append(board)
+                total += cost
+            deferred = len(by_cost) - len(selected)
+            if deferred:
+                logger.info(f"Deadline {deadline_minutes:g} min: deferring {deferred} boards that do not fit the budget.")
+            return selected
+
+        return by_cost
+
+    def record(self, board: Dict[str, str], duration: float):
+        """Track actual vs. estimated time to correct the ETA as the run progresses."""
+        self.estimated_done += self.estimate(board)
+        self.actual_done += duration
+
+    def remaining_seconds(self, remaining: List[Dict[str, str]]) -> float:
+        """Estimated time left, scaled by how accurate the estimates have been so far."""
+        estimate = sum(self.estimate(board) for board in remaining)
+        if self.estimated_done > 0:
+            estimate *= self.actual_done / self.estimated_done
+        return estimate
+
+    def eta_message(self, remaining: List[Dict[str, str]]) -> str:
+        seconds = self.remaining_seconds(remaining)
+        finish = datetime.datetime.now() + datetime.timedelta(seconds=seconds)
+        return f"[ETA] {len(remaining)} boards left, ~{format_duration(seconds)} remaining (finish ~{finish.strftime('%H:%M')})"
+
+# ==================== Session Store ====================
+
+class SessionStore:
+    """Persists Miro session cookies and local storage to a small JSON file."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+
+    def exists(self) -> bool:
+        return os.path.exists(self.filepath)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the saved session, or None if missing or unreadable."""
+        if not self.exists():
+            return None
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not data.get("cookies"):
+                logger.warning("Session file contains no cookies, ignoring.")
+                return None
+            return data
+        except Exception as e:
+            logger.warning(f"Failed to read session file: {e}")
+            return None
+
+    def save(self, cookies: List[Dict], local_storage: Dict[str, str]):
+        data = {
+            "captured_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "cookies": cookies,
+            "local_storage": local_storage,
+        }
+        try:
+            with open(self.filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            logger.info(f"[Session] Saved {len(cookies)} cookies to {self.filepath}")
+        except Exception as e:
+            logger.error(f"Failed to write session file: {e}")
+
+    def delete(self):
+        try:
+            if self.exists():
+                os.remove(self.filepath)
+                logger.info("[Session] Removed stale session file.")
+        except Exception as e:
+            logger.warning(f"Failed to remove session file: {e}")
+
 # ==================== Miro Automator ====================
 
 class MiroAutomator:
     """Main class for Miro automation logic."""
 
+    MIRO_ORIGIN = "https://miro.com"
+    DASHBOARD_URL = "https://miro.com/app/dashboard/"
+    DASHBOARD_SELECTOR = "[data-testid='grid-view'], [data-testid='board-card'], a[href*='/app/board/']"
+
     def __init__(self, config: MiroConfig):
         self.config = config
+        self.session_store = SessionStore(config.session_file)
         self.driver = None
         self.wait_normal = None
         self.wait_long = None
-
-    def start_driver(self):
-        """Initialize Edge driver with options."""
-        logger.info("Starting Edge browser...")
+        self.temp_profile_dir = None
+
+    def start_session(self):
+        """Start a logged-in browser, preferring the fast saved-session bootstrap.
+
+        With a saved session, Edge starts from a fresh temporary profile and the
+        cookies/local storage are injected. Otherwise (or if the session was
+        rejected) the real Edge profile is used and a new session is captured.
+        """
+        if self.config.use_session_file:
+            session = self.session_store.load()
+            if session:
+                self.start_driver(use_profile=False)
+                if self._restore_session(session):
+                    return
+                logger.warning("Saved session rejected, falling back to Edge profile...")
+                self.session_store.delete()
+                self.stop_driver()
+
+        self.start_driver(use_profile=True)
+        if self.config.use_session_file:
+            self.capture_session()
+
+    def start_driver(self, use_profile: bool = True):
+        """Initialize Edge driver with options.
+
+        use_profile=True attaches to the real Edge user profile (slow, exclusive).
+        use_profile=False uses a throwaway minimal profile, so several drivers can
+        run side by side.
+        """
         options = Options()
-        options.add_argument(f"user-data-dir={self.config.user_data_dir}")
-        options.add_argument(f"profile-directory={self.config.profile_dir}")
+        if use_profile:
+            logger.info("Starting Edge browser (user profile)...")
+            options.add_argument(f"user-data-dir={self.config.user_data_dir}")
+            options.add_argument(f"profile-directory={self.config.profile_dir}")
+        else:
+            logger.info("Starting Edge browser (temporary profile)...")
+            self.temp_profile_dir = tempfile.mkdtemp(prefix="miro_edge_")
+            options.add_argument(f"user-data-dir={self.temp_profile_dir}")
+            options.add_argument("--no-first-run")
+            options.add_argument("--no-default-browser-check")
+            options.add_argument("--disable-sync")
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-component-update")
+        if self.config.headless:
+            options.add_argument("--headless=new")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("detach", True)
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
@@ -216,7 +449,69 @@ class MiroAutomator:
     def stop_driver(self):
         if self.driver:
             self.driver.quit()
+            self.driver = None
             logger.info("Browser closed.")
+        if self.temp_profile_dir:
+            shutil.rmtree(self.temp_profile_dir, ignore_errors=True)
+            self.temp_profile_dir = None
+
+    def _is_logged_in(self) -> bool:
+        """Open the dashboard and check that board content shows up."""
+        self.driver.get(self.DASHBOARD_URL)
+        if not self._smart_wait(By.CSS_SELECTOR, self.DASHBOARD_SELECTOR, 15):
+            return False
+        return "/login" not in self.driver.current_url
+
+    def capture_session(self):
+        """Save the current Miro cookies and local storage to the session file."""
+        try:
+            if not self._is_logged_in():
+                logger.warning("[Session] Dashboard not reachable, session not captured.")
+                return
+            cookies = self.driver.get_cookies()
+            local_storage = self.driver.execute_script("""
+                let items = {};
+                for (let i = 0; i < window.localStorage.length; i++) {
+                    let key = window.localStorage.key(i);
+                    items[key] = window.localStorage.getItem(key);
+                }
+                return items;
+            """) or {}
+            self.session_store.save(cookies, local_storage)
+        except Exception as e:
+            logger.warning(f"[Session] Failed to capture session: {e}")
+
+    def _restore_session(self, session: Dict[str, Any]) -> bool:
+        """Inject saved cookies/local storage and verify the login is accepted."""
+        try:
+            # Cookies can only be set for the domain currently loaded
+            self.driver.get(f"{self.MIRO_ORIGIN}/robots.txt")
+
+            injected = 0
+            for cookie in session.get("cookies", []):
+                cookie = {k: v for k, v in cookie.items()
+                          if k in ("name", "value", "domain", "path", "secure", "httpOnly", "expiry", "sameSite")}
+                try:
+                    self.driver.add_cookie(cookie)
+                    injected += 1
+                except Exception as e:
+                    logger.debug(f"Skipped cookie {cookie.get('name')}: {e}")
+
+            local_storage = session.get("local_storage") or {}
+            if local_storage:
+                self.driver.execute_script("""
+                    let items = arguments[0];
+                    for (let key in items) {
+                        window.localStorage.setItem(key, items[key]);
+                    }
+                """, local_storage)
+
+            logger.info(f"[Session] Injected {injected} cookies, {len(local_storage)} storage items "
+                        f"(captured {session.get('captured_at', 'unknown')}).")
+            return self._is_logged_in()
+        except Exception as e:
+            logger.warning(f"[Session] Failed to restore session: {e}")
+            return False
 
     def _smart_wait(self, by: str, value: str, timeout: int = 5) -> bool:
         """Helper for optional element waiting."""
@@ -238,10 +533,10 @@ class MiroAutomator:
                 seen_urls.add(item)
 
         logger.info("Opening Dashboard to scrape links...")
-        self.driver.get("https://miro.com/app/dashboard/")
+        self.driver.get(self.DASHBOARD_URL)
 
         # Wait for dashboard
-        if not self._smart_wait(By.CSS_SELECTOR, "[data-testid='grid-view'], [data-testid='board-card'], a[href*='/app/board/']", 15):
+        if not self._smart_wait(By.CSS_SELECTOR, self.DASHBOARD_SELECTOR, 15):
             logger.warning("Timeout waiting for Dashboard, attempting to scroll anyway...")
 
         time.sleep(2) # Short buffer
@@ -402,32 +697,50 @@ class MiroAutomator:
             return True
 
     def batch_export(self, links: List[Dict], report: CsvReport):
-        """Process all links for export."""
+        """Process all links for export, ordered by the configured schedule policy."""
         successful_urls = report.get_successful_urls()
-        
-        logger.info(f"Starting batch export for {len(links)} boards...")
-        
-        for index, item in enumerate(links):
+        scheduler = ExportScheduler(report.get_history(), self.config.default_board_seconds)
+
+        pending = []
+        for item in links:
             # Normalize item
             if isinstance(item, str):
-                url = item
-                name = "Unknown"
-                owner = "Unknown"
+                board = {"url": item, "name": "Unknown", "owner": "Unknown"}
             else:
-                url = item.get('url')
-                name = item.get('name', 'Unknown')
-                owner = item.get('owner', 'Unknown')
+                board = {"url": item.get('url'), "name": item.get('name', 'Unknown'), "owner": item.get('owner', 'Unknown')}
 
-            if url in successful_urls:
-                logger.info(f"[{index+1}/{len(links)}] Skipping (Already Exported): {name}")
+            if board["url"] in successful_urls:
+                logger.info(f"Skipping (Already Exported): {board['name']}")
                 continue
+            pending.append(board)
 
-            logger.info(f"[{index+1}/{len(links)}] Processing: {name} (Owner: {owner})")
-            
-            result = self._export_single_board(url, name, owner)
+        queue = scheduler.order(pending, self.config.schedule_policy, self.config.deadline_minutes)
+        total_estimate = sum(scheduler.estimate(board) for board in queue)
+        logger.info(f"Starting batch export for {len(queue)} boards "
+                    f"(policy: {self.config.schedule_policy}, estimated {format_duration(total_estimate)})...")
+
+        deadline = None
+        if self.config.schedule_policy == "deadline" and self.config.deadline_minutes is not None:
+            deadline = time.monotonic() + self.config.deadline_minutes * 60
+
+        for index, board in enumerate(queue):
+            estimate = scheduler.estimate(board)
+            if deadline is not None and time.monotonic() + estimate > deadline:
+                logger.info(f"Deadline reached, stopping with {len(queue) - index} boards left.")
+                break
+
+            logger.info(f"[{index+1}/{len(queue)}] Processing: {board['name']} "
+                        f"(Owner: {board['owner']}, est. {format_duration(estimate)})")
+
+            start = time.monotonic()
+            result = self._export_single_board(board["url"], board["name"], board["owner"])
+            result["duration"] = time.monotonic() - start
             report.upsert_result(result)
 
-    def _export_single_board(self, url: str, name: str, owner: str) -> Dict[str, str]:
+            scheduler.record(board, result["duration"])
+            logger.info(scheduler.eta_message(queue[index+1:]))
+
+    def _export_single_board(self, url: str, name: str, owner: str) -> Dict[str, Any]:
         result = {"name": name, "url": url, "owner": owner, "status": "Pending", "error": ""}
         
         try:
@@ -614,7 +927,7 @@ def main():
     automator = MiroAutomator(config)
 
     try:
-        automator.start_driver()
+        automator.start_session()
 
         # 1. Load Local Links
         links = []